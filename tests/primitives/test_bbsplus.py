@@ -20,6 +20,7 @@ def test_signature_setup():
     signature = creator.obtain_signature(presignature)
 
     assert com.verify_blinding(pk) and signature.verify_signature(pk, messages)
+    assert not signature.verify_signature(pk, messages[:-1] + [Bn(13)])
 
 
 def test_signature_proof():
@@ -1,4 +1,5 @@
 import random
+import time
 
 import pytest
 
@@ -12,6 +13,7 @@ from zksk.exceptions import (
     ValidationError,
     GroupMismatchError,
 )
+from zksk import composition
 from zksk.composition import AndProofStmt, OrProofStmt
 from zksk.expr import wsum_secrets
 from zksk.utils import make_generators
@@ -483,3 +485,118 @@ def test_invalid_or_composition_inside_two_or():
 
     with pytest.raises(InvalidSecretsError):
         st.prove()
+
+
+def test_prehash_statement_is_cached(params):
+    p1, p2, secrets = params
+    andp = AndProofStmt(p1, p2)
+    prehash = andp.prehash_statement()
+    digest = prehash.digest()
+    prehash.update(b"message")
+    assert andp.prehash_statement().digest() == digest
+    assert AndProofStmt(p1, p2).prehash_statement().digest() == digest
+
+
+def test_nested_stmts_are_flattened(params):
+    p1, p2, secrets = params
+    andp = AndProofStmt(AndProofStmt(p1, p2), p1)
+    assert len(andp.subproofs) == 3
+
+    orp = OrProofStmt(OrProofStmt(p1, p2), p1)
+    assert len(orp.subproofs) == 3
+
+    nested = OrProofStmt(p1, p2)
+    nested.set_simulated()
+    orp = OrProofStmt(nested, p1)
+    assert len(orp.subproofs) == 2
+
+    assert len((p1 & p2 & p1).subproofs) == 3
+    assert len((p1 | p2 | p1 | p2).subproofs) == 4
+
+    nizk = andp.prove(secrets)
+    assert andp.verify(nizk)
+
+
+def count_uncached_verifications(monkeypatch, stmt_cls):
+    calls = []
+    verify_uncached = stmt_cls.verify_uncached
+
+    def counting_verify_uncached(self, nizk, message=""):
+        calls.append(message)
+        return verify_uncached(self, nizk, message)
+
+    monkeypatch.setattr(stmt_cls, "verify_uncached", counting_verify_uncached)
+    return calls
+
+
+def test_verify_results_are_cached(params, monkeypatch):
+    p1, p2, secrets = params
+    andp = AndProofStmt(p1, p2)
+    nizk = andp.prove(secrets, message="msg")
+    calls = count_uncached_verifications(monkeypatch, AndProofStmt)
+
+    assert andp.verify(nizk, message="msg")
+    assert andp.verify(nizk, message="msg")
+    assert calls == ["msg"]
+
+    assert not andp.verify(nizk, message="other")
+    assert not andp.verify(nizk, message="other")
+    assert calls == ["msg", "other"]
+
+
+def test_verify_results_are_not_cached_without_complete_id(monkeypatch):
+    class OpaqueDLRep(DLRep):
+        def has_complete_id(self):
+            return False
+
+    g, h = make_generators(2)
+    x = Secret(value=3)
+    andp = AndProofStmt(OpaqueDLRep(x.value * g, x * g), DLRep(x.value * h, x * h))
+    nizk = andp.prove(message="msg")
+    calls = count_uncached_verifications(monkeypatch, AndProofStmt)
+
+    assert andp.verify(nizk, message="msg")
+    assert andp.verify(nizk, message="msg")
+    assert calls == ["msg", "msg"]
+
+
+def test_parallel_simulations_keep_subproof_order(monkeypatch):
+    class DelayedStmt:
+        def __init__(self, index, delay):
+            self.index = index
+            self.delay = delay
+
+        def simulate_proof(self):
+            time.sleep(self.delay)
+            return self.index
+
+    # Later subproofs finish first, the results must still follow the subproof order.
+    monkeypatch.setattr(composition.os, "cpu_count", lambda: 4)
+    subproofs = [DelayedStmt(i, 0.01 * (4 - i)) for i in range(4)]
+    assert composition._simulate_subproofs(subproofs) == [0, 1, 2, 3]
+
+
+def test_malformed_verify_cache_size_falls_back_to_default(monkeypatch):
+    monkeypatch.setenv("ZKSK_VERIFY_CACHE_SIZE", "lots")
+    with pytest.warns(UserWarning):
+        size = composition._read_verify_cache_size()
+    assert size == composition._DEFAULT_VERIFY_CACHE_SIZE
+
+    monkeypatch.setenv("ZKSK_VERIFY_CACHE_SIZE", "0")
+    assert composition._read_verify_cache_size() == 0
+
+
+@pytest.mark.parametrize("stmt_cls", [AndProofStmt, OrProofStmt])
+def test_overlapping_interactive_verifiers(stmt_cls):
+    g, h = make_generators(2)
+    x, y = Secret(value=3), Secret(value=5)
+    stmt = stmt_cls(DLRep(3 * g, x * g), DLRep(5 * h, y * h))
+
+    verifier1, verifier2 = stmt.get_verifier(), stmt.get_verifier()
+    assert verifier1 is not verifier2
+
+    prover1, prover2 = stmt.get_prover(), stmt.get_prover()
+    challenge1 = verifier1.send_challenge(prover1.commit())
+    challenge2 = verifier2.send_challenge(prover2.commit())
+    assert verifier1.verify(prover1.compute_response(challenge1))
+    assert verifier2.verify(prover2.compute_response(challenge2))
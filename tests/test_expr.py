@@ -92,3 +92,11 @@ def test_expr_repr(group, num):
         "Expression({}, {})".format(x, g) for x, g in zip(secrets, generators)
     )
     assert expected_repr == repr(expr)
+
+
+@pytest.mark.parametrize("other", [2, "gibberish"])
+def test_wsum_secrets_invalid_secret(group, other):
+    generators = make_generators(2, group)
+
+    with pytest.raises(InvalidExpression):
+        wsum_secrets([Secret(), other], generators)
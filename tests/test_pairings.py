@@ -114,3 +114,50 @@ def test_pack_unpack_gt(group_pair):
     pt2 = pack.decode(data)
 
     assert pt1 == pt2
+
+
+def test_multi_pair(group_pair):
+    """
+    Multi-pairing equals the sum of the separate pairings, and skips points at infinity.
+    """
+    G1, G2, GT = group_pair.groups()
+    g1, g2 = G1.generator(), G2.generator()
+    r1, r2 = G1.order().random(), G1.order().random()
+    pairs = [(r1 * g1, g2), (g1, r2 * g2)]
+    expected = (r1 * g1).pair(g2) + g1.pair(r2 * g2)
+    assert GT.multi_pair(pairs) == expected
+    assert GT.multi_pair(pairs + [(G1.infinite(), g2)]) == expected
+    assert GT.multi_pair([(g1, G2.infinite())]) == GT.infinite()
+
+    # Pairings cancelling out
+    p, q = r1 * g1, r2 * g2
+    assert GT.multi_pair([(p, q), (-1 * p, q)]) == GT.infinite()
+    assert GT.multi_pair([(p, q), (p, -1 * q)]) == GT.infinite()
+
+
+def test_g2_make_affine(group_pair):
+    G1, G2, _ = group_pair.groups()
+    h = G2.order().random() * G2.generator()
+    expected = G1.generator().pair(h)
+    h.make_affine()
+    assert G1.generator().pair(h) == expected
+
+
+def test_wsum(group_pair):
+    for group in group_pair.groups()[:2]:
+        g = group.generator()
+        weights = [group.order().random(), 3, -2]
+        generators = [group.order().random() * g for _ in weights]
+        expected = group.infinite()
+        for w, h in zip(weights, generators):
+            expected = expected + w * h
+        assert group.wsum(weights, generators) == expected
+        assert group.wsum([], []) == group.infinite()
+
+
+def test_g2_generator_mul(group_pair):
+    G2 = group_pair.G2
+    g = G2.generator()
+    other = G2.infinite() + g
+    for nb in [G2.order().random(), 0, -3]:
+        assert g * nb == other * nb
@@ -3,16 +3,11 @@ Common clases, including subclassable basic provers and verifiers.
 """
 
 import abc
-import random
-import string
-from petlib.ec import EcGroup, EcPt
-from petlib.bn import Bn
-from petlib.pack import *
-import binascii
-import msgpack
-from hashlib import sha256
-from collections import defaultdict
+
 import attr
+import msgpack
+from petlib.bn import Bn
+from petlib.pack import encode, decode
 
 from zksk.utils import get_random_num
 from zksk.consts import CHALLENGE_LENGTH
@@ -69,6 +64,8 @@ class SimulationTranscript:
 def build_fiat_shamir_challenge(stmt_prehash, *args, message=""):
     """Generate a Fiat-Shamir challenge.
 
+    >>> from hashlib import sha256
+    >>> from petlib.ec import EcGroup
     >>> prehash = sha256(b"statement id")
     >>> commitment = 42 * EcGroup().generator()
     >>> isinstance(build_fiat_shamir_challenge(prehash, commitment), Bn)
@@ -79,16 +76,13 @@ def build_fiat_shamir_challenge(stmt_prehash, *args, message=""):
         args: Items to hash (e.g., commitments)
         message: Message to make it a signature PK.
     """
-    # Start building the complete hash for the challenge
-    for elem in args:
-        if not isinstance(elem, bytes) and not isinstance(elem, str):
-            encoded = encode(elem)
-        else:
-            encoded = elem
-        stmt_prehash.update(encoded)
-
-    stmt_prehash.update(message.encode())
-    return Bn.from_hex(stmt_prehash.hexdigest())
+    # Build the complete hash for the challenge, feeding it all the items in one update
+    encoded = [
+        elem if isinstance(elem, (bytes, str)) else encode(elem) for elem in args
+    ]
+    encoded.append(message.encode())
+    stmt_prehash.update(b"".join(encoded))
+    return Bn.from_binary(stmt_prehash.digest())
 
 
 class Prover(metaclass=abc.ABCMeta):
@@ -4,39 +4,138 @@ Composable proof statements, provers, and verifiers.
 
 import abc
 import copy
-import random
+import os
+import secrets
+import threading
+import warnings
 from hashlib import sha256
-from collections import defaultdict
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from petlib.bn import Bn
 from petlib.pack import encode
 
 from zksk.consts import CHALLENGE_LENGTH
-from zksk.base import Prover, Verifier, SimulationTranscript
+from zksk.base import NIZK, Prover, Verifier, SimulationTranscript
 from zksk.expr import Secret, update_secret_values
-from zksk.utils import get_random_num, sum_bn_array
+from zksk.utils import get_random_num, get_random_scalars
 from zksk.utils.misc import get_default_attr
 from zksk.exceptions import StatementSpecError, StatementMismatch
 from zksk.exceptions import InvalidSecretsError, GroupMismatchError
 from zksk.exceptions import InconsistentChallengeError
 
+# Challenges are drawn in [0, 2^CHALLENGE_LENGTH), so or-proof subchallenges add up modulo this.
+_CHALLENGE_MODULUS = Bn(2).pow(CHALLENGE_LENGTH)
 
-def _find_residual_challenge(subchallenges, challenge, modulus):
+_DEFAULT_VERIFY_CACHE_SIZE = 1024
+
+
+def _read_verify_cache_size():
+    """
+    Read the verification cache capacity from the ``ZKSK_VERIFY_CACHE_SIZE`` variable.
+
+    The value must be an integer. Anything else is ignored with a warning, so a malformed
+    environment does not prevent importing zksk.
     """
+    raw = os.environ.get("ZKSK_VERIFY_CACHE_SIZE")
+    if raw is None:
+        return _DEFAULT_VERIFY_CACHE_SIZE
+    try:
+        return int(raw)
+    except ValueError:
+        warnings.warn(
+            "ZKSK_VERIFY_CACHE_SIZE should be an integer, got {!r}. Using {}.".format(
+                raw, _DEFAULT_VERIFY_CACHE_SIZE
+            )
+        )
+        return _DEFAULT_VERIFY_CACHE_SIZE
+
+
+# Results of past verifications, most recently used last. The capacity can be set through the
+# ZKSK_VERIFY_CACHE_SIZE environment variable, 0 disables the cache.
+_VERIFY_CACHE_SIZE = _read_verify_cache_size()
+_VERIFY_CACHE = OrderedDict()
+_VERIFY_CACHE_LOCK = threading.Lock()
+
+
+def _find_residual_challenge(subchallenges, challenge, chal_length=CHALLENGE_LENGTH):
+    r"""
     Determine the complement to a global challenge in a list
 
     For example, to find :math:`c_1` such that :math:`c = c_1 + c_2 + c_3 \mod k`, we compute
     :math:`c_2 + c_3 - c` and take the opposite.
 
+    >>> _find_residual_challenge([Bn(3), Bn(7)], Bn(5), chal_length=4)
+    11
+
     Args:
         subchallenges: The array of subchallenges :math:`c_2`, c_3, ...`
         challenge: The global challenge to reach
-        modulus: the modulus :math:`k`
+        chal_length: Bit length :math:`n` of the challenges, so that :math:`k = 2^n`
+    """
+    if chal_length == CHALLENGE_LENGTH:
+        modulus = _CHALLENGE_MODULUS
+    else:
+        modulus = Bn(2).pow(chal_length)
+
+    # Accumulate without intermediate reductions, and reduce only once at the end.
+    total = -challenge
+    for subchallenge in subchallenges:
+        total = total + subchallenge
+    return (-total) % modulus
+
+
+def _simulate_subproofs(subproofs, prepare=False):
+    """
+    Simulate several subproofs with random challenges.
+
+    The simulations are independent, so they are run in parallel threads when there are several of
+    them and more than one CPU. The expensive group operations happen in OpenSSL, which runs
+    without holding the GIL.
+
+    Args:
+        subproofs: Proof statements to simulate.
+        prepare (bool): Whether to call ``prepare_simulate_proof`` before simulating each of them.
+
+    Returns:
+        list: :py:class:`base.SimulationTranscript` objects, in the order of the subproofs.
+    """
+
+    def simulate(subproof):
+        if prepare:
+            subproof.prepare_simulate_proof()
+        return subproof.simulate_proof()
+
+    num_workers = min(len(subproofs), os.cpu_count() or 1)
+    if num_workers < 2:
+        return [simulate(subproof) for subproof in subproofs]
+
+    # Use a fresh pool for every call. Nested or-proofs simulate from within the worker threads,
+    # and waiting on a shared pool from one of its own workers could deadlock.
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        return list(executor.map(simulate, subproofs))
+
+
+def _flatten_subproofs(subproofs, stmt_cls):
     """
-    modulus = Bn(2).pow(modulus)
-    temp_arr = subchallenges.copy()
-    temp_arr.append(-challenge)
-    return -sum_bn_array(temp_arr, modulus)
+    Merge the subproofs of nested statements of the same kind into one list.
+
+    Conjunctions and disjunctions are associative, so nested statements of the same kind as their
+    parent can be replaced by their subproofs. Nested statements designated as simulated are kept,
+    as they must be simulated as a whole.
+
+    Args:
+        subproofs: Proof statements.
+        stmt_cls: Class of the parent statement, :py:class:`AndProofStmt` or
+            :py:class:`OrProofStmt`.
+    """
+    flat = []
+    for subproof in subproofs:
+        if isinstance(subproof, stmt_cls) and not subproof.simulated:
+            flat.extend(subproof.subproofs)
+        else:
+            flat.append(subproof)
+    return flat
 
 
 def _assign_secret_ids(secret_vars):
@@ -61,6 +160,15 @@ def _assign_secret_ids(secret_vars):
     return secret_id_map
 
 
+class _CompletedRandomizers(dict):
+    """
+    Mapping from secrets to randomizers that has a randomizer for every secret of a subtree.
+
+    Returned by :py:meth:`ComposableProofStmt.update_randomizers`, so that the subproofs the mapping
+    is passed down to do not check it again.
+    """
+
+
 class ComposableProofStmt(metaclass=abc.ABCMeta):
     """
     A composable sigma-protocol proof statement.
@@ -88,6 +196,16 @@ class ComposableProofStmt(metaclass=abc.ABCMeta):
         ordered_secret_ids = [secret_id_map[s.name] for s in secret_vars]
         return [self.__class__.__name__, bases, ordered_secret_ids]
 
+    def _feed_hash(self, h, secret_id_map=None):
+        """
+        Feed the proof ID into a hash object.
+
+        Args:
+            h: Hash object to update.
+            secret_id_map: A map from secret names to consecutive identifiers.
+        """
+        h.update(encode(self.get_proof_id(secret_id_map)))
+
     def get_secret_vars(self):
         """
         Collect all secrets in this subtree.
@@ -119,15 +237,7 @@ class ComposableProofStmt(metaclass=abc.ABCMeta):
         If called multiple times, subproofs are flattened so that only one :py:class:`AndProofStmt`
         remains at the root.
         """
-        if isinstance(other, AndProofStmt):
-            if isinstance(self, AndProofStmt):
-                return AndProofStmt(*self.subproofs, *other.subproofs)
-            else:
-                return AndProofStmt(self, *other.subproofs)
-
-        elif isinstance(self, AndProofStmt):
-            return AndProofStmt(*self.subproofs, other)
-
+        # AndProofStmt absorbs the subproofs of nested conjunctions itself.
         return AndProofStmt(self, other)
 
     def __or__(self, other):
@@ -137,15 +247,7 @@ class ComposableProofStmt(metaclass=abc.ABCMeta):
         If called multiple times, subproofs are flattened so that only one :py:class:`OrProofStmt`
         remains at the root.
         """
-        if isinstance(other, OrProofStmt):
-            if isinstance(self, OrProofStmt):
-                return OrProofStmt(*self.subproofs, *other.subproofs)
-            else:
-                return OrProofStmt(self, *other.subproofs)
-
-        elif isinstance(self, OrProofStmt):
-            return OrProofStmt(*self.subproofs, other)
-
+        # OrProofStmt absorbs the subproofs of nested disjunctions itself.
         return OrProofStmt(self, other)
 
     def get_prover_cls(self):
@@ -200,6 +302,39 @@ class ComposableProofStmt(metaclass=abc.ABCMeta):
     def verify(self, nizk, message=""):
         """
         Verify a non-interactive proof.
+
+        For statements with a static tree whose ID covers every left-hand side, the outcome of
+        verifying a :py:class:`base.NIZK` is remembered, so verifying the same proof and message
+        against the same statement again is a cache lookup. See :py:meth:`verify_uncached` to
+        always run the verification.
+        """
+        if (
+            _VERIFY_CACHE_SIZE <= 0
+            or not isinstance(nizk, NIZK)
+            or not self.has_static_id()
+            or not self.has_complete_id()
+        ):
+            return self.verify_uncached(nizk, message)
+
+        key = sha256(
+            self.prehash_statement().digest() + nizk.serialize() + message.encode()
+        ).digest()
+        with _VERIFY_CACHE_LOCK:
+            result = _VERIFY_CACHE.get(key)
+            if result is not None:
+                _VERIFY_CACHE.move_to_end(key)
+                return result
+
+        result = self.verify_uncached(nizk, message)
+        with _VERIFY_CACHE_LOCK:
+            _VERIFY_CACHE[key] = result
+            if len(_VERIFY_CACHE) > _VERIFY_CACHE_SIZE:
+                _VERIFY_CACHE.popitem(last=False)
+        return result
+
+    def verify_uncached(self, nizk, message=""):
+        """
+        Verify a non-interactive proof, bypassing the cache of past verifications.
         """
         verifier = self.get_verifier()
         return verifier.verify_nizk(nizk, message)
@@ -253,25 +388,55 @@ class ComposableProofStmt(metaclass=abc.ABCMeta):
         Args:
             randomizers_dict: A dictionary to enforce
         """
+        # A dictionary completed higher up in the tree already covers all secrets of this subtree.
+        if isinstance(randomizers_dict, _CompletedRandomizers):
+            return randomizers_dict
+
         # If we are not provided a randomizer dict from above, we compute it.
         if randomizers_dict is None:
             randomizers_dict = self.get_randomizers()
 
-        # TODO: This can be done easier.
-
         # Fill the dictionary.
-        elif any([x not in randomizers_dict for x in self.get_secret_vars()]):
+        elif any(x not in randomizers_dict for x in self.get_secret_vars()):
             tmp = self.get_randomizers()
             tmp.update(randomizers_dict)
             randomizers_dict = tmp
 
-        return randomizers_dict
+        return _CompletedRandomizers(randomizers_dict)
+
+    def has_static_id(self):
+        """
+        Tell if the proof ID is fixed once the statement is constructed.
+
+        This is the case unless the statement depends on precommitments, see
+        :py:class:`zksk.extended.ExtendedProofStmt`. Static IDs can be cached.
+        """
+        return True
+
+    def has_complete_id(self):
+        """
+        Tell if the proof ID captures everything the verification depends on.
+
+        The default ID only covers the bases and the secrets, so it says nothing about the
+        left-hand side of a custom statement. Verification results are only cached for statements
+        which override this to return True, see :py:class:`zksk.primitives.dlrep.DLRep`.
+        """
+        return False
 
     def prehash_statement(self):
         """
         Return a hash of the proof's ID.
+
+        The hash is computed once and cached if the proof ID is static. A copy is returned each
+        time, so callers can update it without changing the cached value.
         """
-        return sha256(encode(str(self.get_proof_id())))
+        prehash = get_default_attr(self, "_prehash_cache")
+        if prehash is None:
+            prehash = sha256()
+            self._feed_hash(prehash)
+            if self.has_static_id():
+                self._prehash_cache = prehash
+        return prehash.copy()
 
     @property
     def simulated(self):
@@ -361,11 +526,11 @@ class _CommonComposedStmtMixin:
             bases: Elliptic curve base points.
         """
         bases = self.get_bases()
-        secrets = self.get_secret_vars()
+        secret_vars = self.get_secret_vars()
 
         # We map the unique secrets to the indices where they appear
         mydict = defaultdict(list)
-        for index, word in enumerate(secrets):
+        for index, word in enumerate(secret_vars):
             mydict[word].append(index)
 
         # Now we use this dictionary to check all the bases related to a particular secret live in
@@ -381,14 +546,39 @@ class _CommonComposedStmtMixin:
                         % word
                     )
 
+    def has_static_id(self):
+        return self._static_id
+
+    def has_complete_id(self):
+        return self._complete_id
+
     def get_proof_id(self, secret_id_map=None):
-        secret_vars = self.get_secret_vars()
-        bases = self.get_bases()
+        # Only the ID of the root of the tree can be cached, as the IDs of the subtrees depend on
+        # the secret identifiers assigned at the root.
+        if secret_id_map is None and self._proof_id is not None:
+            return self._proof_id
+
+        cache = secret_id_map is None and self._static_id
         if secret_id_map is None:
-            secret_id_map = _assign_secret_ids(secret_vars)
+            secret_id_map = _assign_secret_ids(self.get_secret_vars())
 
         proof_ids = [sub.get_proof_id(secret_id_map) for sub in self.subproofs]
-        return (self.__class__.__name__, proof_ids)
+        proof_id = (self.__class__.__name__, proof_ids)
+        if cache:
+            self._proof_id = proof_id
+        return proof_id
+
+    def _feed_hash(self, h, secret_id_map=None):
+        # Stream the subtree into the hash, instead of building and encoding the nested proof IDs.
+        if secret_id_map is None:
+            secret_id_map = _assign_secret_ids(self.get_secret_vars())
+
+        h.update(self.__class__.__name__.encode() + b"(")
+        for index, sub in enumerate(self.subproofs):
+            if index > 0:
+                h.update(b",")
+            sub._feed_hash(h, secret_id_map)
+        h.update(b")")
 
     def full_validate(self, *args, **kwargs):
         for sub in self.subproofs:
@@ -414,29 +604,32 @@ class OrProofStmt(_CommonComposedStmtMixin, ComposableProofStmt):
         # We make a shallow copy of each subproof so they don't mess up each other.  This step is
         # important, as we can have different outputs for the same proof (independent simulations or
         # simulations/execution)
-        self.subproofs = [copy.copy(p) for p in list(subproofs)]
+        self.subproofs = [
+            copy.copy(p) for p in _flatten_subproofs(subproofs, OrProofStmt)
+        ]
+        self._static_id = all(p.has_static_id() for p in self.subproofs)
+        self._complete_id = all(p.has_complete_id() for p in self.subproofs)
+        self._proof_id = None
+        self._prehash_cache = None
+        self._validated = False
 
     def recompute_commitment(self, challenge, responses):
         # We retrieve the challenges, hidden in the responses tuple
         self.or_challenges = responses[0]
         responses = responses[1]
 
-        # We check for challenge consistency i.e the constraint was respected
-        if _find_residual_challenge(
-            self.or_challenges, challenge, CHALLENGE_LENGTH
-        ) != Bn(0):
+        # We check for challenge consistency i.e the constraint was respected. This is cheap, so it
+        # is done before any group operation.
+        if _find_residual_challenge(self.or_challenges, challenge) != Bn(0):
             raise InconsistentChallengeError("Inconsistent challenges.")
 
         # Compute the list of commitments, one for each proof with its challenge and responses
-        # (in-order)
-        com = []
-        for index, subproof in enumerate(self.subproofs):
-            com.append(
-                subproof.recompute_commitment(
-                    self.or_challenges[index], responses[index]
-                )
-            )
-        return com
+        # (in-order). No subproof can be skipped: the verifier does not know which one was
+        # simulated, and a prover could otherwise pick the challenge of every other subproof freely.
+        return [
+            subproof.recompute_commitment(self.or_challenges[index], responses[index])
+            for index, subproof in enumerate(self.subproofs)
+        ]
 
     def get_prover(self, secrets_dict=None):
         if secrets_dict is None:
@@ -454,31 +647,30 @@ class OrProofStmt(_CommonComposedStmtMixin, ComposableProofStmt):
         # TODO: Add a unit test where simulation must be True/False for all subproofs
 
         # Prepare the draw. Disqualify proofs with simulation parameter set to true
-        candidates = {}
-        for index, subproof in enumerate(self.subproofs):
-            if not self.subproofs[index].simulated:
-                candidates[index] = subproof
+        possible = [
+            index
+            for index, subproof in enumerate(self.subproofs)
+            if not subproof.simulated
+        ]
 
-        if len(candidates) == 0:
+        if not possible:
             print("Cannot run an or-proof if all elements are simulated")
             return None
 
         # Now choose a proof among the possible ones and try to get a prover from it.
         # If for some reason it does not work (e.g some secrets are missing), remove it
         # from the list of possible proofs and try again
-        random_gen = random.SystemRandom()
-        possible = list(candidates.keys())
-        self.chosen_idx = random_gen.choice(possible)
+        self.chosen_idx = secrets.choice(possible)
 
         # Feed the selected proof the secrets it needs if we have them, and try to get_prover
         valid_prover = self.subproofs[self.chosen_idx].get_prover(secrets_dict)
         while valid_prover is None:
             possible.remove(self.chosen_idx)
             # If there is no proof left, abort and say we cannot get a prover
-            if len(possible) == 0:
+            if not possible:
                 self.chosen_idx = None
                 return None
-            self.chosen_idx = random_gen.choice(possible)
+            self.chosen_idx = secrets.choice(possible)
             valid_prover = self.subproofs[self.chosen_idx].get_prover(secrets_dict)
         return OrProver(self, valid_prover)
 
@@ -488,8 +680,14 @@ class OrProofStmt(_CommonComposedStmtMixin, ComposableProofStmt):
     def validate_composition(self):
         """
         Validate that composition is done correctly.
+
+        The result is remembered for statements with a static tree, so the checks run only once
+        however many times the statement is proved.
         """
+        if self._validated:
+            return
         self.validate_group_orders()
+        self._validated = self.has_static_id()
 
     def validate_secrets_reoccurence(self, forbidden_secrets=None):
         """
@@ -504,12 +702,12 @@ class OrProofStmt(_CommonComposedStmtMixin, ComposableProofStmt):
             :py:class:`exceptions.InvalidSecretsError`: If any secrets re-occur in an
                 unsupported way.
         """
-        secret_vars = self.get_secret_vars()
         if forbidden_secrets is None:
             return
 
-        for secret in set(secret_vars):
-            if forbidden_secrets.count(secret) > secret_vars.count(secret):
+        forbidden_counts = Counter(forbidden_secrets)
+        for secret, count in Counter(self.get_secret_vars()).items():
+            if forbidden_counts[secret] > count:
                 raise InvalidSecretsError(
                     "Invalid secrets found. Try to flatten the proof to avoid "
                     "using secrets used inside an or-proof in other parts of "
@@ -530,20 +728,17 @@ class OrProofStmt(_CommonComposedStmtMixin, ComposableProofStmt):
         or_chals = []
         precom = []
 
-        # Generate one simulation at a time and update a list of each attribute.
-        for index, subproof in enumerate(self.subproofs[:-1]):
-            transcript = subproof.simulate_proof()
+        # Simulate all but the last subproof at once, and update a list of each attribute.
+        for transcript in _simulate_subproofs(self.subproofs[:-1]):
             com.append(transcript.commitment)
             resp.append(transcript.responses)
             or_chals.append(transcript.challenge)
             precom.append(transcript.precommitment)
 
         # Generate the last simulation.
-        final_chal = _find_residual_challenge(or_chals, challenge, CHALLENGE_LENGTH)
+        final_chal = _find_residual_challenge(or_chals, challenge)
         or_chals.append(final_chal)
-        final_transcript = self.subproofs[index + 1].simulate_proof(
-            challenge=final_chal
-        )
+        final_transcript = self.subproofs[-1].simulate_proof(challenge=final_chal)
         com.append(final_transcript.commitment)
         resp.append(final_transcript.responses)
         precom.append(final_transcript.precommitment)
@@ -574,30 +769,42 @@ class OrProver(Prover):
         # Create a list storing the SimulationTranscripts
         self.setup_simulations()
 
+        # Map each subproof to the index of its simulation, or to None for the subproof run by the
+        # subprover. Note that len(simulations) = len(subproofs) - 1.
+        self._sim_idx = list(range(len(self.simulations)))
+        self._sim_idx.insert(self.true_prover_idx, None)
+        self._commitment_cache = None
+
     def setup_simulations(self):
         """
         Run all the required simulations and stores them.
         """
-        self.simulations = []
-        for index, subproof in enumerate(self.stmt.subproofs):
-            if index != self.true_prover_idx:
-                subproof.prepare_simulate_proof()
-                sim = subproof.simulate_proof()
-                self.simulations.append(sim)
+        simulated_subproofs = [
+            subproof
+            for index, subproof in enumerate(self.stmt.subproofs)
+            if index != self.true_prover_idx
+        ]
+        self.simulations = _simulate_subproofs(simulated_subproofs, prepare=True)
 
     def precommit(self):
         # Generate precommitment for the legit subprover, and gather the precommitments from the
-        # stored simulations.
+        # stored simulations. The commitments only need the precommitments to be done, so they are
+        # gathered in the same pass and kept for the following internal_commit call.
         precommitment = []
-        for index, _ in enumerate(self.stmt.subproofs):
-            if index == self.true_prover_idx:
+        commitment = []
+        for sim_idx in self._sim_idx:
+            if sim_idx is None:
                 precommitment.append(self.subprover.precommit())
+                commitment.append(None)
             else:
-                if index > self.true_prover_idx:
-                    index1 = index - 1
-                else:
-                    index1 = index
-                precommitment.append(self.simulations[index1].precommitment)
+                simulation = self.simulations[sim_idx]
+                precommitment.append(simulation.precommitment)
+                commitment.append(simulation.commitment)
+
+        self.stmt.validate_composition()
+        commitment[self.true_prover_idx] = self.subprover.internal_commit()
+        self._commitment_cache = commitment
+
         if not any(precommitment):
             return None
         return precommitment
@@ -610,20 +817,23 @@ class OrProver(Prover):
             randomizers_dict: A dictionary of randomizers to use for responses consistency. Not used
                 in this proof. Parameter kept so all internal_commit methods have the same prototype.
         """
+        # Use the commitment gathered by precommit if any. It is only valid for one run.
+        if self._commitment_cache is not None:
+            commitment = self._commitment_cache
+            self._commitment_cache = None
+            return commitment
+
         # Now that all proofs have been constructed, we can check
         self.stmt.validate_composition()
 
-        commitment = []
-        for index, _ in enumerate(self.stmt.subproofs):
-            if index == self.true_prover_idx:
-                commitment.append(self.subprover.internal_commit())
-            else:
-                if index > self.true_prover_idx:
-                    index1 = index - 1
-                else:
-                    index1 = index
-                commitment.append(self.simulations[index1].commitment)
-        return commitment
+        return [
+            (
+                self.subprover.internal_commit()
+                if sim_idx is None
+                else self.simulations[sim_idx].commitment
+            )
+            for sim_idx in self._sim_idx
+        ]
 
     def compute_response(self, challenge):
         """
@@ -639,22 +849,17 @@ class OrProver(Prover):
             challenge: The global challenge to use. All subchallenges must add to this one.
         """
         residual_chal = _find_residual_challenge(
-            [el.challenge for el in self.simulations], challenge, CHALLENGE_LENGTH
+            [el.challenge for el in self.simulations], challenge
         )
         response = []
         challenges = []
-        for index, subproof in enumerate(self.stmt.subproofs):
-            if index == self.true_prover_idx:
+        for sim_idx in self._sim_idx:
+            if sim_idx is None:
                 challenges.append(residual_chal)
                 response.append(self.subprover.compute_response(residual_chal))
             else:
-                # Note that len(simulations) = len(subproofs) - 1.
-                if index > self.true_prover_idx:
-                    index1 = index - 1
-                else:
-                    index1 = index
-                challenges.append(self.simulations[index1].challenge)
-                response.append(self.simulations[index1].responses)
+                challenges.append(self.simulations[sim_idx].challenge)
+                response.append(self.simulations[sim_idx].responses)
 
         return (challenges, response)
 
@@ -694,10 +899,13 @@ class OrVerifier(Verifier):
             responses: a tuple (subchallenges, actual_responses) from which we extract only the
                 actual responses for each subverifier.
         """
-        if responses_dict is None:
-            responses_dict = {}
+        # Each member gets an empty dictionary, as secrets are not shared across or-clauses. Reuse a
+        # single dictionary and clear it between members.
+        sub_responses_dict = {}
         for index, sub in enumerate(self.subs):
-            if not sub.check_responses_consistency(responses[1][index], {}):
+            sub_responses_dict.clear()
+            sub_responses = responses[1][index]
+            if not sub.check_responses_consistency(sub_responses, sub_responses_dict):
                 return False
         return True
 
@@ -720,20 +928,33 @@ class AndProofStmt(_CommonComposedStmtMixin, ComposableProofStmt):
         # We make a shallow copy of each subproof so they dont mess with each other.  This step is
         # important in case we have proofs which locally draw random values.  It ensures several
         # occurrences of the same proof in the tree indeed have their own randomnesses.
-        self.subproofs = [copy.copy(p) for p in list(subproofs)]
+        self.subproofs = [
+            copy.copy(p) for p in _flatten_subproofs(subproofs, AndProofStmt)
+        ]
+        self._static_id = all(p.has_static_id() for p in self.subproofs)
+        self._complete_id = all(p.has_complete_id() for p in self.subproofs)
+        self._proof_id = None
+        self._prehash_cache = None
+        self._validated = False
 
     def validate_composition(self, *args, **kwargs):
         """
         Validate that composition is done correctly.
+
+        The result is remembered for statements with a static tree, so the checks run only once
+        however many times the statement is proved.
         """
+        if self._validated:
+            return
         self.validate_group_orders()
         self.validate_secrets_reoccurence()
+        self._validated = self.has_static_id()
 
     def recompute_commitment(self, challenge, responses):
-        com = []
-        for index, subproof in enumerate(self.subproofs):
-            com.append(subproof.recompute_commitment(challenge, responses[index]))
-        return com
+        return [
+            subproof.recompute_commitment(challenge, responses[index])
+            for index, subproof in enumerate(self.subproofs)
+        ]
 
     def get_prover(self, secrets_dict=None):
         if secrets_dict is None:
@@ -763,15 +984,26 @@ class AndProofStmt(_CommonComposedStmtMixin, ComposableProofStmt):
         """
         Create a dictionary of randomizers by querying the subproofs' maps and merging them.
         """
-        random_vals = {}
-
         # Pair each Secret to one generator. Overwrites when a Secret re-occurs but since the
         # associated bases should yield groups of same order, it's fine.
         dict_name_gen = {s: g for s, g in zip(self.get_secret_vars(), self.get_bases())}
 
+        # Group the secrets by the group of their generator, so that each group order is only
+        # fetched once. Groups are not necessarily hashable, hence the ids.
+        orders = {}
+        secrets_by_group = defaultdict(list)
+        for secret, gen in dict_name_gen.items():
+            group_id = id(gen.group)
+            if group_id not in orders:
+                orders[group_id] = gen.group.order()
+            secrets_by_group[group_id].append(secret)
+
         # Pair each Secret to a randomizer.
-        for u in dict_name_gen:
-            random_vals[u] = dict_name_gen[u].group.order().random()
+        random_vals = {}
+        for group_id, group_secrets in secrets_by_group.items():
+            order = orders[group_id]
+            randomizers = get_random_scalars(order, len(group_secrets))
+            random_vals.update(zip(group_secrets, randomizers))
 
         return random_vals
 
@@ -852,17 +1084,12 @@ class AndProver(Prover):
 
         If not applicable (no subprover outputs a precommitment), returns None.
         """
-        precommitment = []
-        for index, sub in enumerate(self.subs):
-            # Collect precommitments one by one
-            sub_precommitment = sub.precommit()
-            if sub_precommitment is not None:
-                if len(precommitment) == 0:
-                    precommitment = [None] * len(self.subs)
-                precommitment[index] = sub_precommitment
+        precommitment = [sub.precommit() for sub in self.subs]
 
         # If any precommitment is valid, return the list. If all were None, return None.
-        return precommitment if len(precommitment) != 0 else None
+        if any(p is not None for p in precommitment):
+            return precommitment
+        return None
 
     def internal_commit(self, randomizers_dict=None):
         """
@@ -932,10 +1159,10 @@ class AndVerifier(Verifier):
         if responses_dict is None:
             responses_dict = {}
 
-        for index, sub in enumerate(self.subs):
-            if not sub.check_responses_consistency(responses[index], responses_dict):
-                return False
-        return True
+        return all(
+            sub.check_responses_consistency(responses[index], responses_dict)
+            for index, sub in enumerate(self.subs)
+        )
 
     def process_precommitment(self, precommitment):
         """
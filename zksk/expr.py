@@ -11,10 +11,11 @@ Tiny expression language suitable for expressing statements on discrete logarith
 
 """
 
-import struct
-import hashlib
+import itertools
+import secrets
 
 from zksk.exceptions import InvalidExpression, IncompleteValuesError
+from zksk.utils import ensure_bn
 
 
 class Expression:
@@ -33,14 +34,34 @@ class Expression:
     """
 
     def __init__(self, secret, base):
-        if not isinstance(secret, Secret):
-            raise InvalidExpression(
-                "In {0} * {1}, the first parameter should be a Secret".format(
-                    secret, base
+        self._set_terms([secret], [base])
+
+    @classmethod
+    def from_terms(cls, secret_vars, bases):
+        """
+        Build the expression :math:`x_0 g_0 + ... + x_n g_n` from its secrets and bases.
+
+        Args:
+            secret_vars: :py:class:`Secret` objects :math:`x_i`
+            bases: Base points :math:`g_i`, one per secret
+
+        Returns:
+            Expression: New expression
+        """
+        expr = cls.__new__(cls)
+        expr._set_terms(secret_vars, bases)
+        return expr
+
+    def _set_terms(self, secret_vars, bases):
+        for secret, base in zip(secret_vars, bases):
+            if not isinstance(secret, Secret):
+                raise InvalidExpression(
+                    "In {0} * {1}, the first parameter should be a Secret".format(
+                        secret, base
+                    )
                 )
-            )
-        self._secrets = [secret]
-        self._bases = [base]
+        self._secrets = list(secret_vars)
+        self._bases = list(bases)
 
     def __add__(self, other):
         """
@@ -77,13 +98,8 @@ class Expression:
                     "Secret {0} does not have a value".format(secret.name)
                 )
 
-        def ith_mul(i):
-            return self._secrets[i].value * self._bases[i]
-
-        summation = ith_mul(0)
-        for i in range(1, len(self._secrets)):
-            summation += ith_mul(i)
-        return summation
+        values = [ensure_bn(secret.value) for secret in self._secrets]
+        return self._bases[0].group.wsum(values, self._bases)
 
     def __repr__(self):
         fragments = []
@@ -104,6 +120,11 @@ class Secret:
     # Number of bytes in a randomly-generated name of a secret.
     NUM_NAME_BYTES = 8
 
+    # Generated names are a random per-process prefix followed by a counter, so they never repeat
+    # within a process and are cheap to make.
+    _name_prefix = secrets.token_hex(NUM_NAME_BYTES)
+    _name_counter = itertools.count()
+
     def __init__(self, value=None, name=None):
         if name is None:
             name = self._generate_unique_name()
@@ -111,8 +132,11 @@ class Secret:
         self.value = value
 
     def _generate_unique_name(self):
-        h = struct.pack(">q", super().__hash__())
-        return hashlib.sha256(h).hexdigest()[: self.NUM_NAME_BYTES * 4]
+        return "%s%0*x" % (
+            self._name_prefix,
+            self.NUM_NAME_BYTES * 2,
+            next(self._name_counter),
+        )
 
     def __mul__(self, base):
         """
@@ -145,7 +169,7 @@ class Secret:
         return (hash(self) == hash(other)) and self.value == other.value
 
 
-def wsum_secrets(secrets, bases):
+def wsum_secrets(secret_vars, bases):
     """
     Build expression representing a dot product of given secrets and bases.
 
@@ -159,19 +183,19 @@ def wsum_secrets(secrets, bases):
     True
 
     Args:
-        secrets: :py:class:`Secret` objects :math`x_i`
+        secret_vars: :py:class:`Secret` objects :math:`x_i`
         bases: Elliptic curve points :math:`G_i`
 
     Returns:
         Expression: Expression that corresponds to :math:`x_0 G_0 + x_1 G_1 + ... + x_n G_n`
     """
-    if len(secrets) != len(bases):
+    if len(secret_vars) != len(bases):
         raise ValueError("Should have as many secrets as bases.")
+    if not secret_vars:
+        raise ValueError("Need at least one secret.")
 
-    result = secrets[0] * bases[0]
-    for idx in range(len(bases) - 1):
-        result = result + secrets[idx + 1] * bases[idx + 1]
-    return result
+    # Build the expression in one go rather than through a chain of additions.
+    return Expression.from_terms(secret_vars, bases)
 
 
 def update_secret_values(secrets_dict):
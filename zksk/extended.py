@@ -25,6 +25,8 @@ The protocol of an extended proof is as follows:
 
 import abc
 
+from petlib.pack import encode
+
 from zksk.base import Prover, Verifier
 from zksk.composition import ComposableProofStmt
 from zksk.exceptions import StatementSpecError
@@ -109,8 +111,7 @@ class ExtendedProofStmt(ComposableProofStmt, metaclass=abc.ABCMeta):
         for k, v in secrets_dict.items():
             k.value = v
 
-        self.secret_values = {}
-        self.secret_values.update(secrets_dict)
+        self.secret_values = dict(secrets_dict)
 
         return ExtendedProver(self, self.secret_values)
 
@@ -134,6 +135,18 @@ class ExtendedProofStmt(ComposableProofStmt, metaclass=abc.ABCMeta):
             raise ValueError("Proof ID unknown before the proof is constructed.")
         return proof_id
 
+    def _feed_hash(self, h, secret_id_map=None):
+        if self.constructed_stmt is None:
+            raise ValueError("Proof ID unknown before the proof is constructed.")
+        h.update(encode([self.__class__.__name__, self.precommitment]))
+        self.constructed_stmt._feed_hash(h, secret_id_map)
+
+    def has_static_id(self):
+        """
+        The proof ID depends on the precommitment, so it cannot be cached.
+        """
+        return False
+
     def full_construct_stmt(self, precommitment):
         self._precommitment = precommitment
         self._constructed_stmt = self.construct_stmt(precommitment)
@@ -2,10 +2,10 @@
 Wrapper around ``bplib`` points that ensures additive notation for all points.
 """
 
-import attr
-
 from bplib.bp import BpGroup, G1Elem, G2Elem, GTElem
+from bplib.bindings import _FFI, _C
 
+from petlib.bn import Bn
 import petlib.pack as pack
 import msgpack
 
@@ -75,6 +75,34 @@ class GTGroup:
             res = res + w * g
         return res
 
+    def multi_pair(self, pairs):
+        """
+        Sum the pairings of a list of (G1, G2) point pairs.
+
+        The Miller loops of all pairs are accumulated and a single final exponentiation is
+        computed, which is cheaper than summing separate pairings.
+
+        Args:
+            pairs: List of (:py:class:`G1Point`, :py:class:`G2Point`) tuples.
+        """
+        # Pairings with a point at infinity are the neutral element. They are skipped, as the
+        # underlying ``bplib`` function does not handle them properly.
+        pairs = [(p, q) for p, q in pairs if not (p.pt.isinf() or q.pt.isinf())]
+        if not pairs:
+            return self.infinite()
+
+        bpgp = self.bp.bpgp
+        g1_elems = _FFI.new("const G1_ELEM *[]", [p.pt.elem for p, _ in pairs])
+        g2_elems = _FFI.new("const G2_ELEM *[]", [q.pt.elem for _, q in pairs])
+        res = GTElem(bpgp)
+        if not _C.GT_ELEMs_pairing(
+            bpgp.bpg, res.elem, len(pairs), g1_elems, g2_elems, _FFI.NULL
+        ):
+            # The batched computation fails when the Miller loop product is degenerate, e.g., when
+            # the pairings cancel out. Sum the individual pairings instead.
+            return self.sum(p.pair(q) for p, q in pairs)
+        return AdditivePoint(res, self.bp)
+
 
 # TODO: Why should this not just be called GTPoint?
 class AdditivePoint:
@@ -168,12 +196,15 @@ class G2Point:
     Args:
         pt (``bplib.bp.G2Point``): Point.
         bp (:py:class:`BilinearGroupPair`): Group pair.
+        is_generator (bool): Whether the point is the group generator, for which multiplications
+            use the table precomputed by ``bplib``.
     """
 
-    def __init__(self, pt, bp):
+    def __init__(self, pt, bp, is_generator=False):
         self.pt = pt
         self.bp = bp
         self.group = self.bp.G2
+        self.is_generator = is_generator
 
     def __eq__(self, other):
         return self.pt == other.pt
@@ -185,8 +216,32 @@ class G2Point:
         return self + (-1 * other)
 
     def __mul__(self, nb):
+        if self.is_generator:
+            return self._mul_generator(nb)
         return G2Point(self.pt * nb, self.bp)
 
+    def _mul_generator(self, nb):
+        """Multiply the generator using the fixed-base precomputation of ``bplib``."""
+        scalar = nb if isinstance(nb, Bn) else Bn.from_num(nb)
+        bpgp = self.bp.bpgp
+        res = G2Elem(bpgp)
+        if not _C.G2_ELEM_mul(
+            bpgp.bpg, res.elem, scalar.bn, _FFI.NULL, _FFI.NULL, _FFI.NULL
+        ):
+            raise RuntimeError("Scalar multiplication failed")
+        return G2Point(res, self.bp)
+
+    def make_affine(self):
+        """
+        Convert the point to affine coordinates, in place.
+
+        Pairings convert their G2 argument to affine coordinates first, which is free for points
+        that already are. Useful for fixed points that are paired repeatedly.
+        """
+        if not _C.G2_ELEM_make_affine(self.bp.bpgp.bpg, self.pt.elem, _FFI.NULL):
+            raise RuntimeError("Could not convert the point to affine coordinates")
+        return self
+
     def export(self, form=0):
         return self.pt.export(form) if form else self.pt.export()
 
@@ -240,10 +295,9 @@ class G1Group:
 
     # TODO throw these on a base class
     def wsum(self, weights, generators):
-        res = self.infinite()
-        for w, g in zip(weights, generators):
-            res = res + w * g
-        return res
+        return _multi_mul(
+            self, weights, generators, G1Point, G1Elem, "G1_ELEM", _C.G1_ELEMs_mul
+        )
 
 
 class G2Group:
@@ -262,7 +316,7 @@ class G2Group:
 
     def generator(self):
         if self.gen is None:
-            self.gen = G2Point(self.bp.bpgp.gen2(), self.bp)
+            self.gen = G2Point(self.bp.bpgp.gen2(), self.bp, is_generator=True)
         return self.gen
 
     def infinite(self):
@@ -281,10 +335,37 @@ class G2Group:
         return res
 
     def wsum(self, weights, generators):
-        res = self.infinite()
-        for w, g in zip(weights, generators):
-            res = res + w * g
-        return res
+        return _multi_mul(
+            self, weights, generators, G2Point, G2Elem, "G2_ELEM", _C.G2_ELEMs_mul
+        )
+
+
+def _multi_mul(group, weights, generators, point_cls, elem_cls, elem_type, mul):
+    """
+    Compute a weighted sum of G1 or G2 points in one multi-scalar multiplication.
+
+    Args:
+        group: :py:class:`G1Group` or :py:class:`G2Group` of the points.
+        weights: Scalars.
+        generators: Points. Extra weights or points are ignored, as with ``zip``.
+        point_cls: Wrapper class for the group points.
+        elem_cls: ``bplib`` element class for the group.
+        elem_type: Name of the C type of the group elements.
+        mul: ``bplib`` multi-multiplication function for the group.
+    """
+    pairs = list(zip(weights, generators))
+    if not pairs:
+        return group.infinite()
+
+    # Keep references to the scalars so the underlying BIGNUMs live until the call returns.
+    scalars = [w if isinstance(w, Bn) else Bn.from_num(w) for w, _ in pairs]
+    bpgp = group.bp.bpgp
+    points = _FFI.new("const %s *[]" % elem_type, [g.pt.elem for _, g in pairs])
+    bns = _FFI.new("const BIGNUM *[]", [w.bn for w in scalars])
+    res = elem_cls(bpgp)
+    if not mul(bpgp.bpg, res.elem, _FFI.NULL, len(pairs), points, bns, _FFI.NULL):
+        raise RuntimeError("Multi-scalar multiplication failed")
+    return point_cls(res, group.bp)
 
 
 def pt_enc(obj):
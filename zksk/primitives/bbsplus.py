@@ -10,13 +10,16 @@ See "`Constant-Size Dynamic k-TAA`_" by Au et al., 2008 for the details.
 
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import attr
 
 from zksk.expr import Secret, wsum_secrets
 from zksk.extended import ExtendedProofStmt
 from zksk.composition import AndProofStmt
 from zksk.primitives.dlrep import DLRep
-from zksk.utils import make_generators
+from zksk.utils import make_generators, get_random_scalars
 
 
 @attr.s
@@ -33,11 +36,15 @@ class BBSPlusSignature:
         """
         Verify the validity of the signature w.r.t the given public key and set of messages.
         """
+        # The check e(A, w + e * h0) = e(product, h0), with product = g0 + s * g1 + sum(m_i *
+        # g_{i+1}), is rearranged as e(A, w) + e(e * A - product, h0) = 0. This moves the scalar
+        # multiplication from G2 to G1, where e * A - product is a single multi-multiplication, and
+        # keeps the fixed public key points as the G2 arguments.
         generators = pk.generators[: len(messages) + 2]
-        product = generators[0] + generators[0].group.wsum(
-            ([self.s] + messages), generators[1:]
-        )
-        return self.A.pair(pk.w + self.e * pk.h0) == product.pair(pk.h0)
+        weights = [self.e, -1, -self.s] + [-m for m in messages]
+        g1_side = self.A.group.wsum(weights, [self.A] + generators)
+        gt = pk.h0.group.bp.GT
+        return gt.multi_pair([(self.A, pk.w), (g1_side, pk.h0)]) == gt.infinite()
 
 
 @attr.s
@@ -91,22 +98,22 @@ class BBSPlusSignatureCreator:
         Returns:
             :py:class:`UserCommitmentMessage`: user's packed commitment.
         """
-        lhs = self.pk.generators[0].group.wsum(
-            messages, self.pk.generators[2 : len(messages) + 2]
-        )
+        group = self.pk.generators[0].group
         com_nizk_proof = None
         if zkp:
-            self.s1 = self.pk.generators[0].group.order().random()
-            lhs = self.s1 * self.pk.generators[1] + lhs
+            self.s1 = group.order().random()
+            secrets = [self.s1] + messages
+            generators = self.pk.generators[1 : len(messages) + 2]
+            lhs = group.wsum(secrets, generators)
 
             # TODO: Extract into a separate ExtendedProofStmt.
-            secret_vars = [Secret() for _ in range(len(messages) + 1)]
-            secrets = [self.s1] + messages
-            rhs = wsum_secrets(secret_vars, self.pk.generators[1 : len(messages) + 2])
+            # The secrets carry their values, so no secrets dictionary is needed to prove.
+            secret_vars = [Secret(value=v) for v in secrets]
+            rhs = wsum_secrets(secret_vars, generators)
             com_stmt = DLRep(lhs, rhs)
-            com_nizk_proof = com_stmt.prove(
-                {s: v for s, v in zip(secret_vars, secrets)}
-            )
+            com_nizk_proof = com_stmt.prove()
+        else:
+            lhs = group.wsum(messages, self.pk.generators[2 : len(messages) + 2])
 
         return UserCommitmentMessage(com_message=lhs, com_nizk_proof=com_nizk_proof)
 
@@ -169,7 +176,8 @@ class BBSPlusPublicKey:
     """
     BBS+ public key.
 
-    Automatically pre-computes the generator pairings :math:`e(g_i, h_0)`.
+    Automatically pre-computes the generator pairings :math:`e(g_i, h_0)`, and puts the fixed G2
+    points :math:`w` and :math:`h_0` in affine coordinates so pairings do not convert them again.
     """
 
     w = attr.ib()
@@ -178,7 +186,28 @@ class BBSPlusPublicKey:
 
     def __attrs_post_init__(self):
         """Pre-compute the group pairings."""
-        self.gen_pairs = [g.pair(self.h0) for g in self.generators]
+        self.h0.make_affine()
+        self.w.make_affine()
+        self._g2_w_pair = None
+
+        def pair_with_h0(g):
+            return g.pair(self.h0)
+
+        # The pairings are independent, and bplib computes them without holding the GIL.
+        num_workers = min(len(self.generators), os.cpu_count() or 1)
+        if num_workers < 2:
+            self.gen_pairs = [pair_with_h0(g) for g in self.generators]
+        else:
+            with ThreadPoolExecutor(max_workers=num_workers) as executor:
+                self.gen_pairs = list(executor.map(pair_with_h0, self.generators))
+
+    def get_g2_w_pair(self):
+        """
+        Pairing :math:`e(g_2, w)` used by every signature proof, computed at first use.
+        """
+        if self._g2_w_pair is None:
+            self._g2_w_pair = self.generators[2].pair(self.w)
+        return self._g2_w_pair
 
 
 @attr.s
@@ -202,10 +231,12 @@ class BBSPlusSecretKey:
         signature.
         """
         pedersen_product = lhs
-        e = self.h0.group.order().random()
-        s2 = self.h0.group.order().random()
-        prod = self.generators[0] + s2 * self.generators[1] + pedersen_product
-        A = (self.gamma + e).mod_inverse(self.h0.group.order()) * prod
+        order = self.h0.group.order()
+        e, s2 = get_random_scalars(order, 2)
+        prod = pedersen_product.group.wsum(
+            [1, s2, 1], [self.generators[0], self.generators[1], pedersen_product]
+        )
+        A = (self.gamma + e).mod_inverse(order) * prod
         return BBSPlusSignature(A=A, e=e, s=s2)
 
 
@@ -266,7 +297,7 @@ class BBSPlusSignatureStmt(ExtendedProofStmt):
 
         # Compute auxiliary commitments A1,A2 as mentioned in the paper. Needs two random values r1,r2 and associated delta1,delta2
         # Set true value to computed secrets
-        r1, r2 = self.order.random(), self.order.random()
+        r1, r2 = get_random_scalars(self.order, 2)
         self.r1.value, self.r2.value = r1, r2
         self.delta1.value = r1 * self.signature.e % self.order
         self.delta2.value = r2 * self.signature.e % self.order
@@ -297,7 +328,7 @@ class BBSPlusSignatureStmt(ExtendedProofStmt):
         self.pair_lhs = self.A2.pair(self.pk.w) + (-1 * self.pk.gen_pairs[0])
         bases = [
             -1 * (self.A2.pair(self.pk.h0)),
-            self.bases[2].pair(self.pk.w),
+            self.pk.get_g2_w_pair(),
             self.pk.gen_pairs[2],
         ]
         bases.extend(self.pk.gen_pairs[1 : len(self.bases)])
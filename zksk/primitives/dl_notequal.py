@@ -12,9 +12,9 @@ Blacklisting`_" by Henry and Goldberg, 2013:
     Blacklisting`: https://www.cypherpunks.ca/~iang/pubs/blacronym-wpes.pdf
 """
 
-from zksk.expr import Secret, wsum_secrets
+from zksk.expr import Secret
 from zksk.exceptions import ValidationError
-from zksk.extended import ExtendedProofStmt, ExtendedVerifier
+from zksk.extended import ExtendedProofStmt
 from zksk.composition import AndProofStmt
 from zksk.primitives.dlrep import DLRep
 
@@ -12,18 +12,14 @@ See "`Proof Systems for General Statements about Discrete Logarithms`_" by Camen
     ftp://ftp.inf.ethz.ch/pub/crypto/publications/CamSta97b.pdf
 
 """
-from hashlib import sha256
-
 from petlib.bn import Bn
 
 from zksk.base import Verifier, Prover, SimulationTranscript
 from zksk.expr import Secret, Expression
-from zksk.utils import get_random_num
+from zksk.utils import get_random_num, get_random_scalars
 from zksk.consts import CHALLENGE_LENGTH
 from zksk.composition import ComposableProofStmt
-from zksk.exceptions import IncompleteValuesError, InvalidExpression
-
-import warnings
+from zksk.exceptions import InvalidExpression
 
 
 class DLRepVerifier(Verifier):
@@ -97,10 +93,9 @@ class DLRep(ComposableProofStmt):
                 )
 
         # Construct a dictionary with the secret values we already know
-        self.secret_values = {}
-        for sec in self.secret_vars:
-            if sec.value is not None:
-                self.secret_values[sec] = sec.value
+        self.secret_values = {
+            sec: sec.value for sec in self.secret_vars if sec.value is not None
+        }
 
         self.lhs = lhs
         self.set_simulated(simulated)
@@ -148,6 +143,12 @@ class DLRep(ComposableProofStmt):
         proof_id = super().get_proof_id(secret_id_map)
         return proof_id + [self.lhs]
 
+    def has_complete_id(self):
+        """
+        The proof ID includes the left-hand side, so it identifies the whole statement.
+        """
+        return True
+
     def get_randomizers(self):
         """
         Initialize randomizers for each secret.
@@ -163,11 +164,9 @@ class DLRep(ComposableProofStmt):
             dict: Mapping from secrets to the random values that are needed to compute the responses
                 of the proof.
         """
-        output = {}
+        unique_secrets = set(self.secret_vars)
         order = self.bases[0].group.order()
-        for sec in set(self.secret_vars):
-            output.update({sec: order.random()})
-        return output
+        return dict(zip(unique_secrets, get_random_scalars(order, len(unique_secrets))))
 
     def recompute_commitment(self, challenge, responses):
 
@@ -218,14 +217,10 @@ class DLRepProver(Prover):
 
         # Compute an ordered list of randomizers mirroring the Secret objects
         self.ks = [randomizers_dict[sec] for sec in self.stmt.secret_vars]
-        subcommits = [a * b for a, b in zip(self.ks, self.stmt.bases)]
 
-        # We build the commitment doing the product k0 * g0 + k1 * g1...
-        result = self.stmt.bases[0].group.infinite()
-        for com in subcommits:
-            result = result + com
-
-        return result
+        # We build the commitment doing the product k0 * g0 + k1 * g1... in one multi-scalar
+        # multiplication.
+        return self.stmt.bases[0].group.wsum(self.ks, self.stmt.bases)
 
     def compute_response(self, challenge):
         """
@@ -241,8 +236,14 @@ class DLRepProver(Prover):
             A list of responses
         """
         order = self.stmt.bases[0].group.order()
-        resps = [
-            (self.secret_values[self.stmt.secret_vars[i]] * challenge + k) % order
-            for i, k in enumerate(self.ks)
-        ]
+
+        # Re-occurring secrets share their randomizer, so their response is computed only once.
+        resps_by_secret = {}
+        resps = []
+        for secret, k in zip(self.stmt.secret_vars, self.ks):
+            resp = resps_by_secret.get(secret)
+            if resp is None:
+                resp = (self.secret_values[secret] * challenge + k) % order
+                resps_by_secret[secret] = resp
+            resps.append(resp)
         return resps
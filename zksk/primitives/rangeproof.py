@@ -19,7 +19,7 @@ from zksk import Secret
 from zksk.primitives.dlrep import DLRep
 from zksk.exceptions import ValidationError
 from zksk.extended import ExtendedProofStmt
-from zksk.utils import make_generators, get_random_num, ensure_bn
+from zksk.utils import get_random_scalars, ensure_bn
 from zksk.composition import AndProofStmt
 
 
@@ -87,8 +87,10 @@ class PowerTwoRangeStmt(ExtendedProofStmt):
         value_as_bits = decompose_into_n_bits(actual_value, self.num_bits)
 
         # Set true value to computed secrets
-        for rand in self.randomizers:
-            rand.value = self.order.random()
+        for rand, value in zip(
+            self.randomizers, get_random_scalars(self.order, self.num_bits)
+        ):
+            rand.value = value
 
         precommitment = {}
         precommitment["Cs"] = [
@@ -133,7 +135,7 @@ class PowerTwoRangeStmt(ExtendedProofStmt):
         return AndProofStmt(*bit_proofs)
 
     def simulate_precommit(self):
-        randomizers = [self.order.random() for _ in range(self.num_bits)]
+        randomizers = get_random_scalars(self.order, self.num_bits)
         precommitment = {}
         precommitment["Cs"] = [r * self.h for r in randomizers]
         precommitment["Cs"][0] += self.com
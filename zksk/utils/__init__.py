@@ -2,6 +2,7 @@ from zksk.utils.groups import (
     make_generators,
     get_random_point,
     get_random_num,
+    get_random_scalars,
     sum_bn_array,
     ensure_bn,
 )
@@ -1,12 +1,11 @@
 import math
 import secrets
 import hashlib
-import warnings
 
 from petlib.bn import Bn
 
 from zksk.consts import DEFAULT_GROUP
-from zksk.exceptions import InvalidExpression
+from zksk.utils.misc import get_default_attr
 
 
 def get_random_point(group=None, random_bits=256, seed=None):
@@ -65,13 +64,25 @@ def make_generators(num, group=None, random_bits=256, seed=42):
     """
     if group is None:
         group = DEFAULT_GROUP
-    generators = [
-        get_random_point(
-            group, random_bits, seed=seed + i if seed is not None else None
-        )
-        for i in range(num)
-    ]
-    return generators
+
+    # Same points as get_random_point for consecutive seeds, with the setup done only once.
+    num_bytes = math.ceil(random_bits / 8)
+    if seed is None:
+        randomness = [secrets.token_bytes(num_bytes) for _ in range(num)]
+        return [group.hash_to_point(r) for r in randomness]
+
+    # Seeded generators are deterministic, so they are cached on the group. A request for fewer
+    # generators than cached is a prefix of the cached list.
+    cache = get_default_attr(group, "_seeded_generators", {})
+    generators = cache.get((random_bits, seed), [])
+    if len(generators) < num:
+        randomness = [
+            hashlib.sha512(b"%i" % (seed + i)).digest()[:num_bytes]
+            for i in range(len(generators), num)
+        ]
+        generators = generators + [group.hash_to_point(r) for r in randomness]
+        cache[(random_bits, seed)] = generators
+    return generators[:num]
 
 
 def get_random_num(bits):
@@ -86,6 +97,28 @@ def get_random_num(bits):
     return order.random()
 
 
+def get_random_scalars(order, num):
+    """
+    Draw several random numbers in :math:`[0, order)` from a single read of system randomness.
+
+    Each number is reduced from 16 bytes more than the order takes, which makes the modular bias
+    negligible.
+
+    >>> order = Bn(1000)
+    >>> xs = get_random_scalars(order, 5)
+    >>> len(xs)
+    5
+    >>> all(0 <= x < order for x in xs)
+    True
+    """
+    num_bytes = (order.num_bits() + 7) // 8 + 16
+    randomness = secrets.token_bytes(num_bytes * num)
+    return [
+        Bn.from_binary(randomness[i : i + num_bytes]) % order
+        for i in range(0, num_bytes * num, num_bytes)
+    ]
+
+
 def sum_bn_array(arr, modulus):
     """
     Sum an array of big numbers under a modulus.